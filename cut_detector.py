@@ -1,17 +1,30 @@
-import base64
+import asyncio
+import hashlib
 import inspect
-import json
+import multiprocessing
 import os
+import re
+import secrets
+import shutil
 import tempfile
 import time
-from contextlib import suppress
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
-from typing import Callable, Dict, List, Optional
+from types import MappingProxyType
+from typing import AsyncIterator, BinaryIO, Callable, Dict, Iterator, List, Optional, Set, Tuple
+from uuid import uuid4
 
-from fastapi import FastAPI, File, Form, Request, UploadFile
-from fastapi.responses import HTMLResponse
+import numpy as np
+import orjson
+from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse, Response, StreamingResponse
+from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from scenedetect import SceneManager, StatsManager, open_video
+from scenedetect import SceneManager, open_video
 from scenedetect.detectors import AdaptiveDetector, ContentDetector, ThresholdDetector
 
 
@@ -20,34 +33,122 @@ SUPPORTED_METHODS = {"content", "adaptive", "threshold"}
 DEFAULT_MIN_LEN = 15
 MIN_MIN_LEN = 1
 MAX_MIN_LEN = 2000
+DEFAULT_FRAME_SKIP = 0
+MAX_FRAME_SKIP = 10
+AUTO_FRAME_SKIP = -1
+AUTO_FRAME_SKIP_SAMPLE_FPS = 3.0
+MAX_MEDIA_FILES = 8
+MEDIA_LEASE_TTL_SECONDS = 6 * 60 * 60
+MAX_SCENE_CACHE_ENTRIES = 16
+MAX_SCENE_DISK_ENTRIES = 256
+MAX_DOWNLOADS = 32
+MEDIA_CHUNK_SIZE = 1 << 20
+_MIME_BY_EXT = MappingProxyType({
+    ".mp4": "video/mp4",
+    ".mov": "video/quicktime",
+    ".mkv": "video/x-matroska",
+    ".avi": "video/x-msvideo",
+    ".webm": "video/webm",
+})
 
 BASE_DIR = Path(__file__).resolve().parent
 TEMPLATE_DIR = BASE_DIR / "templates"
+STATIC_DIR = BASE_DIR / "static"
 
-app = FastAPI(title="CutOnly Analyzer")
+
+def resolve_ram_dir() -> Optional[Path]:
+    # Uploaded videos are written once and then decoded by OpenCV; while that
+    # happens they can live on a RAM-backed tmpfs (Linux /dev/shm) to skip the
+    # disk round-trip. Other platforms (e.g. Windows) have no such directory.
+    shm = Path(os.environ.get("CUTONLY_RAM_DIR", "/dev/shm"))
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        return shm
+    return None
+
+
+WORK_DIR = Path(os.environ.get("CUTONLY_WORK_DIR") or tempfile.gettempdir())
+RAM_DIR = resolve_ram_dir()
+UPLOAD_DIR = WORK_DIR / "cutonly_uploads"
+MEDIA_DIR = WORK_DIR / "cutonly_media"
+RAM_UPLOAD_DIR = RAM_DIR / "cutonly_uploads" if RAM_DIR else None
+RAM_MEDIA_DIR = RAM_DIR / "cutonly_media" if RAM_DIR else None
+MEDIA_LEASE_DIR = WORK_DIR / "cutonly_media_leases"
+DOWNLOAD_DIR = WORK_DIR / "cutonly_downloads"
+SEGMENTS_DIR = WORK_DIR / "cutonly_segments"
+SCENE_CACHE_DIR = WORK_DIR / "cutonly_scenes"
+
+# Number of uvicorn worker processes; the detection pool of each one gets an
+# equal share of the CPU cores so the workers do not oversubscribe them.
+WEB_WORKERS = max(1, int(os.environ.get("CUTONLY_WORKERS", "1")))
+DETECTION_WORKERS = max(1, (os.cpu_count() or 1) // WEB_WORKERS)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    yield
+    shutdown_detection_pool()
+    while _PUBLISHED_MEDIA:
+        path = _PUBLISHED_MEDIA.pop()
+        if not media_in_use(path.stem):
+            remove_file_with_retry(str(path))
+
+
+app = FastAPI(title="CutOnly Analyzer", lifespan=lifespan)
+app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 templates = Jinja2Templates(directory=str(TEMPLATE_DIR))
 
+# (content hash, method, frame_skip, luma_only, detector min_scene_len) -> detect_raw_scenes result, least recently used first.
+SCENE_CACHE: "OrderedDict[Tuple[str, str, int, bool, int], Dict[str, object]]" = OrderedDict()
+# key -> (in-flight detection, pool it was submitted to)
+_PENDING_ANALYSES: "Dict[Tuple[str, str, int, bool, int], Tuple[asyncio.Future, ProcessPoolExecutor]]" = {}
+_DETECTION_POOL: Optional[ProcessPoolExecutor] = None
+# Media files created by this process; removed on shutdown unless another worker still uses them.
+_PUBLISHED_MEDIA: Set[Path] = set()
+_RANGE_PATTERN = re.compile(r"bytes=(\d*)-(\d*)")
+_TOKEN_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+try:
+    _DETECT_SCENES_PARAMS = frozenset(inspect.signature(SceneManager.detect_scenes).parameters)
+except (TypeError, ValueError):
+    _DETECT_SCENES_PARAMS = frozenset()
+
 
 def format_seconds(value: float) -> str:
     if value is None or value < 0:
         return "-"
-    minutes = int(value // 60)
-    seconds = value - minutes * 60
-    return f"{minutes:02d}:{seconds:05.2f}"
+    minutes, seconds = divmod(value, 60.0)
+    return f"{int(minutes):02d}:{seconds:05.2f}"
 
 
 def guess_mime_type(filename: str) -> str:
     ext = os.path.splitext(filename or "")[1].lower()
-    return {
-        ".mp4": "video/mp4",
-        ".mov": "video/quicktime",
-        ".mkv": "video/x-matroska",
-        ".avi": "video/x-msvideo",
-        ".webm": "video/webm",
-    }.get(ext, "video/mp4")
+    return _MIME_BY_EXT.get(ext, "video/mp4")
+
+
+def removal_backoff(attempt: int, base_delay: float = 0.05, max_delay: float = 0.5) -> float:
+    return min(base_delay * (2 ** attempt), max_delay)
+
+
+def remove_file_with_retry(path: str, attempts: int = 5) -> bool:
+    if not path:
+        return True
+
+    file_path = Path(path)
+    for attempt in range(attempts):
+        try:
+            file_path.unlink()
+            return True
+        except FileNotFoundError:
+            return True
+        except OSError:
+            if attempt == attempts - 1:
+                break
+        time.sleep(removal_backoff(attempt))
+
+    return False
 
 
-def remove_file_with_retry(path: str, attempts: int = 5, delay: float = 0.2) -> bool:
+async def remove_file_with_retry_async(path: str, attempts: int = 5) -> bool:
     if not path:
         return True
 
@@ -58,63 +159,273 @@ def remove_file_with_retry(path: str, attempts: int = 5, delay: float = 0.2) ->
             return True
         except FileNotFoundError:
             return True
-        except (PermissionError, OSError):
+        except OSError:
             if attempt == attempts - 1:
                 break
-        time.sleep(delay)
+        await asyncio.sleep(removal_backoff(attempt))
 
     return False
 
 
-def detect_cuts(path: str, method: str, min_len_frames: int, progress_callback: Callable[[float], None]) -> Dict[str, object]:
+def prune_directory(directory: Path, keep: int, in_use: Optional[Callable[[Path], bool]] = None) -> None:
+    # Dot-prefixed names are staging files of writes still in progress; they
+    # neither count towards `keep` nor get removed here.
+    with suppress(OSError):
+        entries = sorted(
+            (item for item in directory.iterdir() if not item.name.startswith(".")),
+            key=lambda item: item.stat().st_mtime,
+        )
+        for stale in entries[:-keep]:
+            if in_use is None or not in_use(stale):
+                remove_file_with_retry(str(stale), attempts=1)
+
+
+def find_media_file(token: str) -> Optional[Path]:
+    if not _TOKEN_PATTERN.fullmatch(token):
+        return None
+    # Disk first: a video demoted from RAM is already complete on disk before its
+    # RAM copy is deleted, so lookups never land on a file that is about to go.
+    for directory in (MEDIA_DIR, RAM_MEDIA_DIR):
+        if directory is not None:
+            found = next(directory.glob(f"{token}.*"), None)
+            if found is not None:
+                return found
+    return None
+
+
+# A lease is an empty marker file held for as long as a request needs a media
+# file. Pruning skips leased files, so a video is not deleted by newer uploads
+# from any worker while its detection is still queued or running. Leases left
+# behind by a crashed process stop counting after MEDIA_LEASE_TTL_SECONDS.
+def acquire_media_lease(content_hash: str) -> Path:
+    MEDIA_LEASE_DIR.mkdir(parents=True, exist_ok=True)
+    lease = MEDIA_LEASE_DIR / f"{content_hash}.{uuid4().hex}"
+    lease.touch()
+    return lease
+
+
+def media_in_use(content_hash: str) -> bool:
+    expires_before = time.time() - MEDIA_LEASE_TTL_SECONDS
+    for lease in MEDIA_LEASE_DIR.glob(f"{content_hash}.*"):
+        try:
+            if lease.stat().st_mtime >= expires_before:
+                return True
+        except OSError:
+            continue
+        remove_file_with_retry(str(lease), attempts=1)
+    return False
+
+
+def demote_media_file(path: Path) -> None:
+    # Only in-flight videos stay in RAM; once no request uses one any more it is
+    # moved to the disk-backed media directory, where it is kept for playback.
+    MEDIA_DIR.mkdir(parents=True, exist_ok=True)
+    target = MEDIA_DIR / path.name
+    staging = MEDIA_DIR / f".{path.name}.{uuid4().hex}.tmp"
+    try:
+        shutil.copyfile(path, staging)
+        os.replace(staging, target)
+    except OSError:
+        remove_file_with_retry(str(staging), attempts=1)
+        return
+    if path in _PUBLISHED_MEDIA:
+        _PUBLISHED_MEDIA.discard(path)
+        _PUBLISHED_MEDIA.add(target)
+    remove_file_with_retry(str(path))
+    prune_directory(MEDIA_DIR, MAX_MEDIA_FILES, in_use=lambda item: media_in_use(item.stem))
+
+
+def release_media_lease(lease: Path, media_path: Optional[str], discard: bool = False) -> None:
+    remove_file_with_retry(str(lease))
+    if not media_path or media_in_use(lease.name.split(".", 1)[0]):
+        return
+    path = Path(media_path)
+    if discard:
+        _PUBLISHED_MEDIA.discard(path)
+        remove_file_with_retry(media_path)
+    elif RAM_MEDIA_DIR is not None and path.parent == RAM_MEDIA_DIR:
+        demote_media_file(path)
+
+
+def publish_media_file(upload_path: str, content_hash: str, suffix: str) -> Tuple[str, bool]:
+    # Media files are named by content hash so every worker process can serve
+    # them and re-uploads of the same video share one copy. The flag tells the
+    # caller whether the file is new, i.e. safe to delete if detection fails.
+    existing = find_media_file(content_hash)
+    if existing is not None:
+        remove_file_with_retry(upload_path)
+        with suppress(OSError):
+            os.utime(existing)
+        return str(existing), False
+
+    # Publishing is a rename, so the media directory is on the same filesystem as the upload.
+    in_ram = RAM_UPLOAD_DIR is not None and Path(upload_path).parent == RAM_UPLOAD_DIR
+    media_dir = RAM_MEDIA_DIR if in_ram and RAM_MEDIA_DIR is not None else MEDIA_DIR
+    media_dir.mkdir(parents=True, exist_ok=True)
+    target = media_dir / f"{content_hash}{suffix.lower()}"
+    os.replace(upload_path, target)
+    _PUBLISHED_MEDIA.add(target)
+    prune_directory(media_dir, MAX_MEDIA_FILES, in_use=lambda item: media_in_use(item.stem))
+    return str(target), True
+
+
+def save_upload(source: BinaryIO, destination: str) -> Tuple[str, int]:
+    digest = hashlib.blake2b(digest_size=16)
+    size = 0
+    Path(destination).parent.mkdir(parents=True, exist_ok=True)
+    with open(destination, "wb") as handle:
+        while True:
+            chunk = source.read(MEDIA_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+            handle.write(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def upload_dirs_for(size: Optional[int]) -> List[Path]:
+    # The RAM directory is only used when it has room for the upload with the
+    # same amount to spare; a small tmpfs (64 MB in Docker by default) falls
+    # back to the disk-backed work directory.
+    directories = [UPLOAD_DIR]
+    if RAM_UPLOAD_DIR is not None and RAM_DIR is not None and size:
+        with suppress(OSError):
+            if shutil.disk_usage(RAM_DIR).free >= 2 * size:
+                directories.insert(0, RAM_UPLOAD_DIR)
+    return directories
+
+
+async def spool_upload(video_file: UploadFile, suffix: str) -> Tuple[str, str, int]:
+    # Close the multipart spool as soon as it has been copied so its temp copy
+    # is not kept around for the whole detection run.
+    name = f"{uuid4().hex}{suffix}"
+    try:
+        directories = upload_dirs_for(video_file.size)
+        for directory in directories:
+            destination = str(directory / name)
+            try:
+                content_hash, size = await run_in_threadpool(save_upload, video_file.file, destination)
+            except OSError:
+                await remove_file_with_retry_async(destination)
+                if directory == directories[-1]:
+                    raise
+                await run_in_threadpool(video_file.file.seek, 0)
+                continue
+            return destination, content_hash, size
+        raise OSError("no upload directory available")
+    finally:
+        await video_file.close()
+
+
+def store_json_file(directory: Path, content: bytes) -> str:
+    token = secrets.token_hex(16)
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / f"{token}.json").write_bytes(content)
+    prune_directory(directory, MAX_DOWNLOADS)
+    return token
+
+
+def find_json_file(directory: Path, token: str) -> Optional[Path]:
+    path = directory / f"{token}.json"
+    if not _TOKEN_PATTERN.fullmatch(token) or not path.is_file():
+        return None
+    return path
+
+
+def register_download(content: bytes) -> str:
+    return store_json_file(DOWNLOAD_DIR, content)
+
+
+def register_segments(segments: List[Dict[str, object]]) -> str:
+    return store_json_file(SEGMENTS_DIR, orjson.dumps(segments))
+
+
+def open_media_file(token: str) -> Optional[Tuple[Path, BinaryIO]]:
+    # A lookup can race with a RAM-to-disk demotion; the second attempt then
+    # finds the disk copy. Once opened, the handle stays readable even if the
+    # RAM copy is unlinked.
+    for _ in range(2):
+        media_path = find_media_file(token)
+        if media_path is None:
+            return None
+        try:
+            return media_path, open(media_path, "rb")
+        except FileNotFoundError:
+            continue
+    return None
+
+
+def iter_file_range(handle: BinaryIO, start: int, end: int) -> Iterator[bytes]:
+    with handle:
+        handle.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = handle.read(min(MEDIA_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def detect_raw_scenes(
+    path: str,
+    method: str,
+    progress_callback: Callable[[float], None],
+    frame_skip: int = 0,
+    luma_only: bool = False,
+    min_scene_len: int = 1,
+) -> Dict[str, object]:
     video = open_video(path)
-    total_frames = video.duration.get_frames() if video.duration else 0
+    total_frames = video.duration.frame_num if video.duration else 0
     fps = float(video.frame_rate) if video.frame_rate else 0.0
 
-    stats_manager = StatsManager()
-    manager = SceneManager(stats_manager)
-    min_scene_len = max(1, int(min_len_frames))
+    # AdaptiveDetector compares consecutive frames, so it cannot skip any.
     if method == "adaptive":
-        manager.add_detector(AdaptiveDetector(min_scene_len=min_scene_len))
+        frame_skip = 0
+    elif frame_skip == AUTO_FRAME_SKIP:
+        frame_skip = max(0, int(round(fps / AUTO_FRAME_SKIP_SAMPLE_FPS)) - 1) if fps else 0
+    else:
+        frame_skip = max(0, int(frame_skip))
+    # No StatsManager: the per-frame metrics are never saved or reused, so
+    # they are not collected at all.
+    manager = SceneManager()
+    # auto_downscale (on by default) shrinks frames to ~256 px wide before the
+    # detectors run; frame numbers and min_scene_len stay in source frames.
+    manager.auto_downscale = True
+    if method == "adaptive":
+        manager.add_detector(AdaptiveDetector(min_scene_len=min_scene_len, luma_only=luma_only))
     elif method == "content":
-        manager.add_detector(ContentDetector(min_scene_len=min_scene_len))
+        manager.add_detector(ContentDetector(min_scene_len=min_scene_len, luma_only=luma_only))
     else:
         manager.add_detector(ThresholdDetector(min_scene_len=min_scene_len, add_final_scene=True))
 
-    def _progress(*args, **kwargs):
-        if not total_frames:
-            return
-
-        frame_time = None
-        if args:
-            frame_time = args[0]
-        elif "frame_time" in kwargs:
-            frame_time = kwargs["frame_time"]
+    # detect_scenes only calls back once per detected cut, so progress is taken
+    # from the decode position instead: SceneManager's decode thread reads every
+    # frame through video.read(), which is wrapped to report about once per 1%.
+    decode_read = video.read
+    progress_step = max(1, total_frames // 100)
+    next_report = [progress_step]
 
-        if frame_time is None:
-            return
-
-        try:
-            frame_idx = frame_time.get_frames()  # type: ignore[attr-defined]
-        except AttributeError:
-            try:
-                frame_idx = int(frame_time)
-            except (TypeError, ValueError):
-                return
+    def _read_with_progress(decode: bool = True):
+        frame = decode_read(decode=decode)
+        position = video.frame_number
+        if total_frames and position >= next_report[0]:
+            next_report[0] = position + progress_step
+            with suppress(Exception):
+                progress_callback(min(position / total_frames, 0.999))
+        return frame
 
-        fraction = min(max(frame_idx, 0) / total_frames, 0.999)
-        with suppress(Exception):
-            progress_callback(fraction)
+    video.read = _read_with_progress
 
     detect_kwargs: Dict[str, object] = {}
-    parameters = inspect.signature(manager.detect_scenes).parameters
-    if "callback" in parameters:
-        detect_kwargs["callback"] = _progress
-    elif "callbacks" in parameters:
-        detect_kwargs["callbacks"] = [_progress]
+    if frame_skip and "frame_skip" in _DETECT_SCENES_PARAMS:
+        detect_kwargs["frame_skip"] = frame_skip
 
     try:
         manager.detect_scenes(video, **detect_kwargs)
+        with suppress(Exception):
+            progress_callback(1.0)
     except IndexError as exc:
         raise RuntimeError("フレーム処理中に内部エラーが発生しました。閾値や最小カット長を調整して再試行してください。") from exc
     finally:
@@ -128,59 +439,279 @@ def detect_cuts(path: str, method: str, min_len_frames: int, progress_callback:
                 close()
 
     scenes = manager.get_scene_list()
-    segments: List[Dict[str, float]] = []
-    for start_timecode, end_timecode in scenes:
-        start_frame = start_timecode.get_frames()
-        end_frame = end_timecode.get_frames()
-        duration_frames = end_frame - start_frame
-        if duration_frames < min_len_frames:
+    frames = np.fromiter(
+        (timecode.frame_num for scene in scenes for timecode in scene),
+        dtype=np.int64,
+        count=len(scenes) * 2,
+    ).reshape(-1, 2)
+
+    return {
+        "frames": frames,
+        "method": method,
+        "min_scene_len": min_scene_len,
+        "frame_skip": frame_skip,
+        "total_frames": total_frames,
+        "fps": fps,
+        "duration_seconds": total_frames / fps if fps else 0.0,
+    }
+
+
+def _merge_cuts(cuts: List[int], start: int, end: int, min_len: int) -> List[int]:
+    # Replays FlashFilter's MERGE mode (ContentDetector's default): a cut that
+    # comes too soon starts a run of merged cuts, and the run is closed at its
+    # last cut once min_len frames pass without another one.
+    kept: List[int] = []
+    last_cut = start
+    merging = False
+    merge_enabled = False
+    merge_start = start
+    for cut in cuts:
+        if merging and last_cut - merge_start >= min_len and last_cut + min_len < cut:
+            kept.append(last_cut)
+            merging = False
+        length_met = cut - last_cut >= min_len
+        last_cut = cut
+        if merging:
             continue
-        start_seconds = start_frame / fps if fps else 0.0
-        end_seconds = end_frame / fps if fps else 0.0
-        segments.append(
-            {
-                "index": len(segments) + 1,
-                "start_frame": start_frame,
-                "end_frame": end_frame,
-                "duration_frames": duration_frames,
-                "start_time": start_seconds,
-                "end_time": end_seconds,
-                "duration_seconds": max(end_seconds - start_seconds, 0.0),
-            }
-        )
+        if length_met:
+            merge_enabled = True
+            kept.append(cut)
+        elif merge_enabled:
+            merging = True
+            merge_start = cut
+    if merging and last_cut - merge_start >= min_len and last_cut + min_len < end:
+        kept.append(last_cut)
+    return kept
+
+
+def _suppress_cuts(cuts: List[int], start: int, min_len: int) -> List[int]:
+    # AdaptiveDetector drops any cut that comes less than min_scene_len frames
+    # after the previous one.
+    kept: List[int] = []
+    last_cut = start
+    for cut in cuts:
+        if cut - last_cut >= min_len:
+            kept.append(cut)
+            last_cut = cut
+    return kept
+
 
-    duration_seconds = total_frames / fps if fps else 0.0
+def detection_min_scene_len(method: str, frame_skip: int, min_len_frames: int) -> int:
+    # The replay in merge_short_scenes is only exact for every-frame runs of
+    # ContentDetector and AdaptiveDetector (which never skips frames). With
+    # frame skipping the flash filter only sees the sampled frames, and
+    # ThresholdDetector tracks fades across suppressed cuts, so those runs get
+    # the real min_scene_len and are cached per min_len instead.
+    if method == "adaptive" or (method == "content" and frame_skip == 0):
+        return 1
+    return int(min_len_frames)
+
+
+def merge_short_scenes(frames: np.ndarray, min_len_frames: int, method: str) -> np.ndarray:
+    # The replays are sequential (each decision depends on the last kept cut),
+    # so they stay plain loops; they run once per detected cut, not per frame,
+    # which keeps them cheap next to decoding without a JIT.
+    if len(frames) < 2 or min_len_frames <= 1:
+        return frames
+    start = int(frames[0, 0])
+    end = int(frames[-1, 1])
+    cuts = frames[1:, 0].tolist()
+    if method == "content":
+        kept = _merge_cuts(cuts, start, end, min_len_frames)
+    elif method == "adaptive":
+        kept = _suppress_cuts(cuts, start, min_len_frames)
+    else:
+        return frames
+    bounds = np.array([start, *kept, end], dtype=np.int64)
+    return np.column_stack((bounds[:-1], bounds[1:]))
+
+
+def filter_scenes(raw: Dict[str, object], min_len_frames: int) -> Dict[str, object]:
+    # Runs detected with min_scene_len=1 first get short scenes folded into
+    # their neighbours the way the detector would have; any segment that is
+    # still shorter than min_len (e.g. the final one) is then dropped.
+    frames: np.ndarray = raw["frames"]  # type: ignore[assignment]
+    if int(raw.get("min_scene_len", 1)) < min_len_frames:
+        frames = merge_short_scenes(frames, min_len_frames, str(raw.get("method", DEFAULT_METHOD)))
+    frames = frames[frames[:, 1] - frames[:, 0] >= min_len_frames]
+    fps = float(raw.get("fps") or 0.0)
+    start_frames = frames[:, 0]
+    end_frames = frames[:, 1]
+    seconds = frames / fps if fps else np.zeros(frames.shape)
+    columns: Dict[str, np.ndarray] = {
+        "start_frame": start_frames,
+        "end_frame": end_frames,
+        "duration_frames": end_frames - start_frames,
+        "start_time": seconds[:, 0],
+        "end_time": seconds[:, 1],
+        "duration_seconds": np.maximum(seconds[:, 1] - seconds[:, 0], 0.0),
+    }
+    field_names = tuple(columns)
+    segments: List[Dict[str, float]] = [
+        {"index": index, **dict(zip(field_names, values))}
+        for index, values in enumerate(zip(*(columns[name].tolist() for name in field_names)), start=1)
+    ]
 
     return {
         "segments": segments,
-        "total_frames": total_frames,
+        "columns": columns,
+        "frame_skip": raw.get("frame_skip", 0),
+        "total_frames": raw.get("total_frames"),
         "fps": fps,
-        "duration_seconds": duration_seconds,
+        "duration_seconds": raw.get("duration_seconds"),
     }
 
 
+def detect_cuts(
+    path: str,
+    method: str,
+    min_len_frames: int,
+    progress_callback: Callable[[float], None],
+    frame_skip: int = 0,
+    luma_only: bool = False,
+) -> Dict[str, object]:
+    min_scene_len = detection_min_scene_len(method, frame_skip, min_len_frames)
+    raw = detect_raw_scenes(path, method, progress_callback, frame_skip, luma_only, min_scene_len)
+    return filter_scenes(raw, min_len_frames)
+
+
+def scene_cache_path(content_hash: str, method: str, frame_skip: int, luma_only: bool, min_scene_len: int) -> str:
+    return str(SCENE_CACHE_DIR / f"{content_hash}_{method}_{frame_skip}_{int(luma_only)}_{min_scene_len}.npz")
+
+
+def load_cached_scenes(cache_path: str) -> Optional[Dict[str, object]]:
+    try:
+        with np.load(cache_path) as data:
+            return {
+                "frames": data["frames"],
+                "method": str(data["method"]),
+                "min_scene_len": int(data["min_scene_len"]),
+                "frame_skip": int(data["frame_skip"]),
+                "total_frames": int(data["total_frames"]),
+                "fps": float(data["fps"]),
+                "duration_seconds": float(data["duration_seconds"]),
+            }
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def store_cached_scenes(cache_path: str, raw: Dict[str, object]) -> None:
+    target = Path(cache_path)
+    staging = target.with_name(f"{target.stem}.{uuid4().hex}.tmp.npz")
+    try:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(staging, **raw)
+        os.replace(staging, target)
+    except OSError:
+        remove_file_with_retry(str(staging), attempts=1)
+        return
+
+    prune_directory(target.parent, MAX_SCENE_DISK_ENTRIES)
+
+
+# Workers receive the on-disk path rather than the video bytes, so nothing
+# larger than the arguments and the resulting scene list crosses the pipe.
+# Raw scenes are also persisted per video and option set, so restarts and
+# other worker processes can skip decoding a clip that was seen before.
+def _detect_worker(
+    path: str,
+    method: str,
+    frame_skip: int,
+    luma_only: bool,
+    min_scene_len: int,
+    cache_path: str,
+) -> Dict[str, object]:
+    raw = load_cached_scenes(cache_path)
+    if raw is None:
+        raw = detect_raw_scenes(path, method, lambda _: None, frame_skip, luma_only, min_scene_len)
+        store_cached_scenes(cache_path, raw)
+    return raw
+
+
+def get_detection_pool() -> ProcessPoolExecutor:
+    global _DETECTION_POOL
+    if _DETECTION_POOL is None:
+        _DETECTION_POOL = ProcessPoolExecutor(
+            max_workers=DETECTION_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _DETECTION_POOL
+
+
+def shutdown_detection_pool(broken: Optional[ProcessPoolExecutor] = None) -> None:
+    # With `broken` set, only that pool is shut down; a replacement created by
+    # another request in the meantime keeps running.
+    global _DETECTION_POOL
+    if broken is not None and _DETECTION_POOL is not broken:
+        return
+    if _DETECTION_POOL is not None:
+        _DETECTION_POOL.shutdown(wait=False, cancel_futures=True)
+        _DETECTION_POOL = None
+
+
+async def detect_cuts_cached(
+    content_hash: str,
+    path: str,
+    method: str,
+    min_len_frames: int,
+    frame_skip: int = 0,
+    luma_only: bool = False,
+) -> Dict[str, object]:
+    min_scene_len = detection_min_scene_len(method, int(frame_skip), min_len_frames)
+    key = (content_hash, method, int(frame_skip), bool(luma_only), min_scene_len)
+    cached = SCENE_CACHE.get(key)
+    if cached is not None:
+        SCENE_CACHE.move_to_end(key)
+        return filter_scenes(cached, min_len_frames)
+
+    # Identical requests that arrive while a detection is still running wait
+    # for that run instead of decoding the same video again.
+    entry = _PENDING_ANALYSES.get(key)
+    if entry is None:
+        pool = get_detection_pool()
+        pending = asyncio.get_running_loop().run_in_executor(
+            pool,
+            _detect_worker,
+            path,
+            method,
+            int(frame_skip),
+            bool(luma_only),
+            min_scene_len,
+            scene_cache_path(*key),
+        )
+        _PENDING_ANALYSES[key] = (pending, pool)
+        pending.add_done_callback(lambda _: _PENDING_ANALYSES.pop(key, None))
+    else:
+        pending, pool = entry
+    try:
+        cached = await asyncio.shield(pending)
+    except BrokenProcessPool as exc:
+        shutdown_detection_pool(pool)
+        raise RuntimeError("解析プロセスが異常終了しました。もう一度お試しください。") from exc
+    SCENE_CACHE[key] = cached
+    while len(SCENE_CACHE) > MAX_SCENE_CACHE_ENTRIES:
+        SCENE_CACHE.popitem(last=False)
+    return filter_scenes(cached, min_len_frames)
+
+
 def build_output_payload(video_name: str, analysis: Dict[str, object], notes: Optional[Dict[str, str]] = None) -> Dict[str, object]:
-    notes = notes or {}
-    cuts_payload: List[Dict[str, object]] = []
-    for seg in analysis.get("segments", []):
-        note_key = f"note_{seg['index']}"
-        item = {
-            "index": seg["index"],
-            "start_frame": seg["start_frame"],
-            "end_frame": seg["end_frame"],
-            "duration_frames": seg["duration_frames"],
-            "start_time": seg["start_time"],
-            "end_time": seg["end_time"],
-            "duration_seconds": seg["duration_seconds"],
-        }
-        note_value = notes.get(note_key, "").strip()
-        if note_value:
-            item["note"] = note_value
-        cuts_payload.append(item)
+    notes_by_index = {
+        int(key[len("note_"):]): value.strip()
+        for key, value in (notes or {}).items()
+        if key.startswith("note_") and key[len("note_"):].isdigit() and value.strip()
+    }
+    # Detected segments already carry exactly the exported fields, so they are
+    # reused as-is and only copied when a note has to be attached.
+    cuts_payload: List[Dict[str, object]] = [
+        {**seg, "note": notes_by_index[seg["index"]]} if seg["index"] in notes_by_index else seg
+        for seg in analysis.get("segments", [])
+    ]
     return {
         "input": video_name,
         "method": analysis.get("method"),
         "min_len_frames": analysis.get("min_len_frames"),
+        "frame_skip": analysis.get("frame_skip", 0),
+        "luma_only": analysis.get("luma_only", False),
         "fps": analysis.get("fps"),
         "total_frames": analysis.get("total_frames"),
         "duration_seconds": analysis.get("duration_seconds"),
@@ -188,46 +719,83 @@ def build_output_payload(video_name: str, analysis: Dict[str, object], notes: Op
     }
 
 
+def serialize_output_payload(payload: Dict[str, object]) -> bytes:
+    return orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+
+
 def clamp_min_len(value: int) -> int:
     return max(MIN_MIN_LEN, min(MAX_MIN_LEN, int(value)))
 
 
+def clamp_frame_skip(value: int) -> int:
+    return max(0, min(MAX_FRAME_SKIP, int(value)))
+
+
+def resolve_frame_skip(method: str, frame_skip: int, auto_frame_skip: bool) -> int:
+    if method == "adaptive":
+        return 0
+    return AUTO_FRAME_SKIP if auto_frame_skip else clamp_frame_skip(frame_skip)
+
+
+def summarize_segments(columns: Dict[str, np.ndarray]) -> Dict[str, float]:
+    durations = columns["duration_seconds"]
+    count = len(durations)
+    if not count:
+        return {"count": 0, "longest_seconds": 0.0, "avg_seconds": 0.0, "avg_frames": 0.0}
+    return {
+        "count": count,
+        "longest_seconds": float(durations.max()),
+        "avg_seconds": float(durations.sum()) / count,
+        "avg_frames": float(columns["duration_frames"].sum()) / count,
+    }
+
+
 def prepare_segments_for_ui(
     raw_segments: List[Dict[str, float]],
-    longest_duration: float,
+    columns: Dict[str, np.ndarray],
 ) -> List[Dict[str, object]]:
-    max_duration = float(longest_duration or 0.0)
-    if max_duration <= 0:
-        max_duration = max(
-            (float(seg.get("duration_seconds", 0.0) or 0.0) for seg in raw_segments),
-            default=0.0,
-        )
+    durations = columns["duration_seconds"]
+    max_duration = float(durations.max()) if len(durations) else 0.0
+    ratios = np.clip(durations / max_duration, 0.0, 1.0) if max_duration > 0 else np.zeros_like(durations)
+
     prepared: List[Dict[str, object]] = []
-    for seg in raw_segments:
-        duration_seconds = float(seg.get("duration_seconds", 0.0) or 0.0)
-        ratio = duration_seconds / max_duration if max_duration else 0.0
+    for seg, frames, seconds, ratio in zip(
+        raw_segments,
+        columns["duration_frames"].tolist(),
+        durations.tolist(),
+        ratios.tolist(),
+    ):
         prepared.append(
             {
                 **seg,
-                "start_label": format_seconds(seg.get("start_time", 0.0)),
-                "end_label": format_seconds(seg.get("end_time", 0.0)),
-                "duration_label": f"{seg['duration_frames']} fr / {duration_seconds:.2f} 秒",
-                "duration_brief": f"{duration_seconds:.2f} 秒",
-                "duration_ratio": max(0.0, min(ratio, 1.0)),
+                "start_label": format_seconds(seg["start_time"]),
+                "end_label": format_seconds(seg["end_time"]),
+                "duration_label": f"{frames} fr / {seconds:.2f} 秒",
+                "duration_brief": f"{seconds:.2f} 秒",
+                "duration_ratio": ratio,
             }
         )
     return prepared
 
 
+def build_timeline_html(segments: List[Dict[str, object]]) -> str:
+    return "".join(
+        f'<button class="timeline-chip" data-index="{position}" style="--duration-ratio: {seg["duration_ratio"]:.4f};">'
+        f'<span class="chip-index">#{seg["index"]}</span><span class="chip-meta">{seg["duration_brief"]}</span></button>'
+        for position, seg in enumerate(segments)
+    )
+
+
 def build_default_context(request: Request) -> Dict[str, object]:
     return {
         "request": request,
-        "form": {"method": DEFAULT_METHOD, "min_len": DEFAULT_MIN_LEN},
+        "form": {"method": DEFAULT_METHOD, "min_len": DEFAULT_MIN_LEN, "frame_skip": DEFAULT_FRAME_SKIP, "auto_frame_skip": False, "luma_only": False},
         "message": None,
         "error": None,
         "result": None,
         "MIN_MIN_LEN": MIN_MIN_LEN,
         "MAX_MIN_LEN": MAX_MIN_LEN,
+        "MAX_FRAME_SKIP": MAX_FRAME_SKIP,
     }
 
 
@@ -242,11 +810,17 @@ async def analyze(
     video_file: UploadFile = File(None),
     method: str = Form(DEFAULT_METHOD),
     min_len: int = Form(DEFAULT_MIN_LEN),
+    frame_skip: int = Form(DEFAULT_FRAME_SKIP),
+    auto_frame_skip: bool = Form(False),
+    luma_only: bool = Form(False),
 ) -> HTMLResponse:
     clamped_min_len = clamp_min_len(min_len)
     form_state = {
         "method": method,
         "min_len": clamped_min_len,
+        "frame_skip": clamp_frame_skip(frame_skip),
+        "auto_frame_skip": auto_frame_skip,
+        "luma_only": luma_only,
     }
 
     message = None
@@ -255,85 +829,94 @@ async def analyze(
 
     method = method if method in SUPPORTED_METHODS else DEFAULT_METHOD
     min_len_frames = form_state["min_len"]
+    frame_skip = resolve_frame_skip(method, form_state["frame_skip"], auto_frame_skip)
+    luma_only = luma_only and method != "threshold"
 
-    temp_paths: List[str] = []
-    video_bytes: Optional[bytes] = None
     video_name = ""
     video_mime = "video/mp4"
+    content_hash = ""
+    upload_path = ""
     detection_path: Optional[str] = None
+    media_created = False
+    lease: Optional[Path] = None
 
     if video_file and video_file.filename:
-        video_bytes = await video_file.read()
-        if not video_bytes:
-            error = "アップロードされたファイルが空のようです。"
+        video_name = video_file.filename
+        video_mime = video_file.content_type or guess_mime_type(video_file.filename)
+        suffix = Path(video_file.filename).suffix or ".mp4"
+        try:
+            upload_path, content_hash, upload_size = await spool_upload(video_file, suffix)
+            if upload_size:
+                lease = await run_in_threadpool(acquire_media_lease, content_hash)
+                detection_path, media_created = await run_in_threadpool(publish_media_file, upload_path, content_hash, suffix)
+        except OSError as exc:
+            error = f"動画データの保存に失敗しました: {exc}"
+            await remove_file_with_retry_async(upload_path)
         else:
-            suffix = Path(video_file.filename).suffix or ".mp4"
-            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmpfile:
-                tmpfile.write(video_bytes)
-                detection_path = tmpfile.name
-            temp_paths.append(detection_path)
-            video_name = video_file.filename
-            video_mime = video_file.content_type or guess_mime_type(video_file.filename)
+            if not upload_size:
+                error = "アップロードされたファイルが空のようです。"
+                await remove_file_with_retry_async(upload_path)
     else:
         error = "動画ファイルをアップロードしてください。"
     analysis_result: Optional[Dict[str, object]] = None
     elapsed_ms = 0.0
 
-    if not error and detection_path:
-        if video_bytes is None:
+    try:
+        if not error and detection_path:
+            started_at = time.time()
             try:
-                video_bytes = Path(detection_path).read_bytes()
-            except OSError as exc:
-                error = f"動画データの読み込みに失敗しました: {exc}"
-
-    if not error and detection_path and video_bytes:
-        started_at = time.time()
-        try:
-            analysis_result = detect_cuts(
-                detection_path,
-                method,
-                int(min_len_frames),
-                lambda _: None,
-            )
-        except Exception as exc:  # pylint: disable=broad-except
-            error = f"解析中にエラーが発生しました: {exc}"
-        else:
-            elapsed_ms = (time.time() - started_at) * 1000.0
-            analysis_result.update({
-                "method": method,
-                "min_len_frames": int(min_len_frames),
-            })
-
-    for path in temp_paths:
-        remove_file_with_retry(path)
+                analysis_result = await detect_cuts_cached(
+                    content_hash,
+                    detection_path,
+                    method,
+                    int(min_len_frames),
+                    frame_skip,
+                    luma_only,
+                )
+            except Exception as exc:  # pylint: disable=broad-except
+                error = f"解析中にエラーが発生しました: {exc}"
+            else:
+                elapsed_ms = (time.time() - started_at) * 1000.0
+                analysis_result.update({
+                    "method": method,
+                    "min_len_frames": int(min_len_frames),
+                    "luma_only": luma_only,
+                })
+    finally:
+        if lease is not None:
+            # A freshly published file that could not be analyzed is not worth keeping.
+            discard = media_created and (error is not None or not analysis_result)
+            await run_in_threadpool(release_media_lease, lease, detection_path, discard)
 
-    if not error and analysis_result and video_bytes:
+    if not error and analysis_result:
         raw_segments: List[Dict[str, float]] = analysis_result.get("segments", [])  # type: ignore[assignment]
-        longest_duration = max((float(seg.get("duration_seconds", 0.0) or 0.0) for seg in raw_segments), default=0.0)
-        segments = prepare_segments_for_ui(raw_segments, longest_duration)
+        columns: Dict[str, np.ndarray] = analysis_result["columns"]  # type: ignore[assignment]
+        summary = summarize_segments(columns)
+        longest_duration = summary["longest_seconds"]
+        segments = prepare_segments_for_ui(raw_segments, columns)
         selected_index = 0 if segments else -1
 
-        video_data_url = f"data:{video_mime};base64,{base64.b64encode(video_bytes).decode('ascii')}"
-        total_cuts = len(segments)
+        video_url = app.url_path_for("media", token=content_hash)
+        total_cuts = int(summary["count"])
         total_duration_seconds = float(analysis_result.get("duration_seconds") or 0.0)
         total_duration_label = format_seconds(total_duration_seconds)
         fps = float(analysis_result.get("fps") or 0.0)
-        avg_duration_sec = (
-            sum(seg["duration_seconds"] for seg in raw_segments) / total_cuts if total_cuts else 0.0
-        )
-        avg_duration_frames = (
-            sum(seg["duration_frames"] for seg in raw_segments) / total_cuts if total_cuts else 0.0
-        )
+        avg_duration_sec = summary["avg_seconds"]
+        avg_duration_frames = summary["avg_frames"]
 
         output_payload = build_output_payload(video_name or "result", analysis_result)
-        output_json = json.dumps(output_payload, ensure_ascii=False, indent=2)
-        json_data_url = f"data:application/json;base64,{base64.b64encode(output_json.encode('utf-8')).decode('ascii')}"
+        output_json = serialize_output_payload(output_payload)
+        download_token = await run_in_threadpool(register_download, output_json)
+        download_href = app.url_path_for("download", token=download_token)
+        segments_token = await run_in_threadpool(register_segments, segments)
 
         result_payload = {
             "video_name": video_name or "動画",
-            "video_data_url": video_data_url,
+            "video_url": video_url,
+            "video_mime": video_mime,
             "segments": segments,
-            "segments_json": json.dumps(segments, ensure_ascii=False),
+            "timeline_html": build_timeline_html(segments),
+            "segments_url": app.url_path_for("segments", token=segments_token),
             "selected_index": selected_index,
             "total_cuts": total_cuts,
             "total_duration_label": total_duration_label,
@@ -343,8 +926,8 @@ async def analyze(
             "avg_duration_frames": avg_duration_frames,
             "avg_duration_label": format_seconds(avg_duration_sec),
             "avg_duration_compact": f"{avg_duration_frames:.1f} fr / {avg_duration_sec:.2f} 秒",
-            "download_href": json_data_url,
-            "analysis_json": output_json,
+            "download_href": download_href,
+            "analysis_json": output_json.decode("utf-8"),
             "elapsed_ms": elapsed_ms,
         }
         message = "検出が完了しました。"
@@ -359,6 +942,151 @@ async def analyze(
         "result": result_payload,
         "MIN_MIN_LEN": MIN_MIN_LEN,
         "MAX_MIN_LEN": MAX_MIN_LEN,
+        "MAX_FRAME_SKIP": MAX_FRAME_SKIP,
     }
     return templates.TemplateResponse("index.html", context)
 
+
+async def analyze_batch_item(
+    video_file: UploadFile,
+    method: str,
+    min_len_frames: int,
+    frame_skip: int,
+    luma_only: bool,
+) -> Dict[str, object]:
+    video_name = video_file.filename or "result"
+    suffix = Path(video_name).suffix or ".mp4"
+    upload_path = ""
+    media_path: Optional[str] = None
+    media_created = False
+    lease: Optional[Path] = None
+    analysis_result: Optional[Dict[str, object]] = None
+    try:
+        upload_path, content_hash, upload_size = await spool_upload(video_file, suffix)
+        if not upload_size:
+            return {"input": video_name, "error": "アップロードされたファイルが空のようです。"}
+        # In-flight detections are shared between requests, so they must run on
+        # the content-addressed media file rather than this request's own upload.
+        lease = await run_in_threadpool(acquire_media_lease, content_hash)
+        media_path, media_created = await run_in_threadpool(publish_media_file, upload_path, content_hash, suffix)
+        analysis_result = await detect_cuts_cached(
+            content_hash,
+            media_path,
+            method,
+            min_len_frames,
+            frame_skip,
+            luma_only,
+        )
+    except Exception as exc:  # pylint: disable=broad-except
+        return {"input": video_name, "error": f"解析中にエラーが発生しました: {exc}"}
+    finally:
+        if media_path is None:
+            await remove_file_with_retry_async(upload_path)
+        if lease is not None:
+            discard = media_created and analysis_result is None
+            await run_in_threadpool(release_media_lease, lease, media_path, discard)
+
+    analysis_result.update({
+        "method": method,
+        "min_len_frames": min_len_frames,
+        "luma_only": luma_only,
+    })
+    return build_output_payload(video_name, analysis_result)
+
+
+@app.post("/api/analyze-batch", response_class=ORJSONResponse)
+async def analyze_batch(
+    video_files: List[UploadFile] = File(...),
+    method: str = Form(DEFAULT_METHOD),
+    min_len: int = Form(DEFAULT_MIN_LEN),
+    frame_skip: int = Form(DEFAULT_FRAME_SKIP),
+    auto_frame_skip: bool = Form(False),
+    luma_only: bool = Form(False),
+) -> ORJSONResponse:
+    method = method if method in SUPPORTED_METHODS else DEFAULT_METHOD
+    min_len_frames = clamp_min_len(min_len)
+    frame_skip = resolve_frame_skip(method, frame_skip, auto_frame_skip)
+    luma_only = luma_only and method != "threshold"
+
+    results = await asyncio.gather(
+        *(
+            analyze_batch_item(video_file, method, min_len_frames, frame_skip, luma_only)
+            for video_file in video_files
+            if video_file.filename
+        )
+    )
+    return ORJSONResponse({"results": list(results)})
+
+
+@app.get("/download/{token}.json", name="download")
+async def download(token: str) -> Response:
+    path = find_json_file(DOWNLOAD_DIR, token)
+    if path is None:
+        raise HTTPException(status_code=404, detail="解析結果の有効期限が切れました。もう一度解析してください。")
+    return FileResponse(path, media_type="application/json")
+
+
+@app.get("/api/segments/{token}", name="segments")
+async def segments_data(token: str) -> Response:
+    path = find_json_file(SEGMENTS_DIR, token)
+    if path is None:
+        raise HTTPException(status_code=404, detail="解析結果の有効期限が切れました。もう一度解析してください。")
+    return FileResponse(path, media_type="application/json")
+
+
+@app.get("/media/{token}", name="media")
+async def media(token: str, request: Request) -> Response:
+    opened = open_media_file(token)
+    if opened is None:
+        raise HTTPException(status_code=404, detail="動画が見つかりません。")
+
+    media_path, handle = opened
+    # Playback refreshes the mtime so the oldest-first prune spares videos that
+    # are still being watched.
+    with suppress(OSError):
+        os.utime(media_path)
+    path = str(media_path)
+    mime = guess_mime_type(media_path.name)
+    file_size = os.fstat(handle.fileno()).st_size
+    range_header = request.headers.get("range")
+    match = _RANGE_PATTERN.fullmatch(range_header.strip()) if range_header else None
+    if not match or not any(match.groups()):
+        handle.close()
+        return FileResponse(path, media_type=mime, headers={"Accept-Ranges": "bytes"})
+
+    start_text, end_text = match.groups()
+    if start_text:
+        start = int(start_text)
+        end = min(int(end_text), file_size - 1) if end_text else file_size - 1
+    else:
+        start = max(file_size - int(end_text), 0)
+        end = file_size - 1
+    if start > end or start >= file_size:
+        handle.close()
+        raise HTTPException(status_code=416, headers={"Content-Range": f"bytes */{file_size}"})
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Range": f"bytes {start}-{end}/{file_size}",
+        "Content-Length": str(end - start + 1),
+    }
+    return StreamingResponse(
+        iter_file_range(handle, start, end),
+        status_code=206,
+        media_type=mime,
+        headers=headers,
+    )
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    workers = int(os.environ.get("CUTONLY_WORKERS", str(os.cpu_count() or 1)))
+    # Worker processes re-import this module and size their detection pools from it.
+    os.environ["CUTONLY_WORKERS"] = str(max(1, workers))
+    uvicorn.run(
+        "cut_detector:app",
+        host=os.environ.get("CUTONLY_HOST", "127.0.0.1"),
+        port=int(os.environ.get("CUTONLY_PORT", "8000")),
+        workers=max(1, workers),
+    )